@@ -2,24 +2,43 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import threading
+from bisect import bisect_left
+from collections import Counter
 from typing import Any
 
 import numpy as np
-from fastapi import APIRouter, HTTPException, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from .db import KGReader
-from .hashing import compute_structural_hash
+from .hashing import build_entity_community, compute_structural_hash
 from .sidecar import SidecarDB
 from .timeline import build_event_stream, compress_timeline, timeline_params_hash
 
+try:
+    import simsimd
+except ImportError:  # no wheel for this platform — fall back to NumPy
+    simsimd = None
+
 router = APIRouter(prefix="/api")
 
 # These are set during app startup (see main.py)
 kg: KGReader | None = None
 sidecar: SidecarDB | None = None
 
+# Serialized /graph responses and their ETags keyed by (scope, KG data_version).
+# Only the latest version is kept; position writes clear it since positions are embedded.
+# Handlers run in the threadpool, so the cache is only touched under its lock.
+# Position writes also bump the generation: a build that started before the
+# bump may hold stale positions and is served but not cached.
+_graph_cache: dict[tuple[str | None, int], tuple[bytes, str]] = {}
+_graph_cache_lock = threading.Lock()
+_graph_generation = 0
+
 
 def _kg() -> KGReader:
     if kg is None:
@@ -33,24 +52,53 @@ def _sidecar() -> SidecarDB:
     return sidecar
 
 
+def _invalidate_graph_cache() -> None:
+    global _graph_generation
+    with _graph_cache_lock:
+        _graph_generation += 1
+        _graph_cache.clear()
+
+
+def _etag_response(request: Request, content: bytes, etag: str) -> Response:
+    """Send content with its ETag, or a bodiless 304 if the client already has it."""
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (t.strip().removeprefix("W/") for t in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+
 @router.get("/status")
-async def status():
+def status():
     stats = _kg().get_stats()
     return {"data": stats, "error": None}
 
 
-@router.get("/graph")
-async def get_graph(scope: str | None = None):
+@router.get("/graph", response_class=ORJSONResponse)
+def get_graph(request: Request, scope: str | None = None):
     """Full graph data: entities, observations, relations, communities, positions."""
     reader = _kg()
-    entities = reader.get_entities(scope)
-    observations = reader.get_observations(scope)
-    relations = reader.get_relations(scope)
-    communities = reader.get_communities(scope)
-    obs_counts = reader.get_observation_counts(scope)
+    # One read transaction: the version and all five reads see the same commit
+    with reader.snapshot():
+        cache_key = (scope, reader.get_data_version())
+        with _graph_cache_lock:
+            cached = _graph_cache.get(cache_key)
+            generation = _graph_generation
+        if cached is not None:
+            return _etag_response(request, *cached)
+
+        entities = reader.get_entities(scope)
+        observations = reader.get_observations(scope)
+        relations = reader.get_relations(scope)
+        communities = reader.get_communities(scope)
+        obs_counts = reader.get_observation_counts(scope)
+
+    # Community membership map, shared by the hash and the frontend payload
+    entity_community = build_entity_community(communities)
 
     # Compute structural hash
-    current_hash = compute_structural_hash(entities, relations, communities, obs_counts)
+    current_hash = compute_structural_hash(
+        entities, relations, communities, obs_counts, entity_community
+    )
 
     # Get persisted positions (scoped) — always return them so the frontend
     # can do an incremental layout when only a few entities changed, rather
@@ -60,12 +108,6 @@ async def get_graph(scope: str | None = None):
     stored_hash = db.get_layout_hash(effective_scope)
     positions = db.get_positions(effective_scope)
 
-    # Build community membership map for frontend
-    entity_community: dict[str, str] = {}
-    for comm in communities:
-        for eid in comm.get("member_entity_ids", []):
-            entity_community[eid] = comm["id"]
-
     # Enrich entities with observation count and community
     for e in entities:
         e["observation_count"] = obs_counts.get(e["id"], 0)
@@ -74,7 +116,7 @@ async def get_graph(scope: str | None = None):
         if pos:
             e["position"] = pos
 
-    return {
+    content = orjson.dumps({
         "data": {
             "entities": entities,
             "observations": observations,
@@ -84,11 +126,20 @@ async def get_graph(scope: str | None = None):
             "positions_valid": stored_hash == current_hash,
         },
         "error": None,
-    }
+    })
+    # ETag from the payload itself: layout_hash alone misses observation text
+    # and position changes that also alter the response.
+    etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    with _graph_cache_lock:
+        if generation == _graph_generation:
+            if not any(key[1] == cache_key[1] for key in _graph_cache):
+                _graph_cache.clear()
+            _graph_cache[cache_key] = (content, etag)
+    return _etag_response(request, content, etag)
 
 
 @router.get("/entity/{entity_id}")
-async def get_entity(entity_id: str):
+def get_entity(entity_id: str):
     reader = _kg()
     detail = reader.get_entity_detail(entity_id)
     if not detail:
@@ -104,8 +155,8 @@ async def get_entity(entity_id: str):
     return {"data": detail, "error": None}
 
 
-@router.get("/timeline")
-async def get_timeline(
+@router.get("/timeline", response_class=ORJSONResponse)
+def get_timeline(
     scope: str | None = None,
     compress: bool = True,
     gap_threshold: float = 60.0,
@@ -120,25 +171,26 @@ async def get_timeline(
     # Check cache
     params_hash = timeline_params_hash(scope, gap_threshold, compress)
     cached = db.get_timeline_cache(scope or "all", params_hash)
-    if cached:
-        events = json.loads(cached)
-    else:
-        entities = reader.get_entities(scope)
-        observations = reader.get_observations(scope)
-        relations = reader.get_relations(scope)
-        events = build_event_stream(entities, observations, relations)
+    if not cached:
+        with reader.snapshot():
+            entities = reader.get_entities(scope)
+            observations = reader.get_observations(scope)
+            relations = reader.get_relations(scope)
+        stream = build_event_stream(entities, observations, relations)
         if compress:
-            events = compress_timeline(events, gap_threshold)
-        # Cache the result
-        db.set_timeline_cache(scope or "all", params_hash, json.dumps(events))
+            stream = compress_timeline(stream, gap_threshold)
+        # Cache the result; events are plain dicts only from here on
+        cached = orjson.dumps(stream)
+        db.set_timeline_cache(scope or "all", params_hash, cached)
+    events = orjson.loads(cached)
 
-    # Apply since filter
-    if since:
-        events = [e for e in events if (e.get("timestamp") or "") >= since]
+    # Apply since filter — events are sorted by timestamp string (None as ""),
+    # so the cutoff is a binary search rather than a full scan
+    start = bisect_left(events, since, key=lambda e: e.get("timestamp") or "") if since else 0
 
     # Paginate
-    total = len(events)
-    events = events[offset : offset + limit]
+    total = len(events) - start
+    events = events[start + offset : start + offset + limit]
 
     return {
         "data": events,
@@ -148,7 +200,7 @@ async def get_timeline(
 
 
 @router.get("/layout/positions")
-async def get_positions(scope: str = "global"):
+def get_positions(scope: str = "global"):
     """Get current persisted positions and layout hash."""
     db = _sidecar()
     return {
@@ -167,20 +219,22 @@ class PositionData(BaseModel):
 
 
 @router.post("/layout/positions")
-async def save_positions(data: PositionData):
+def save_positions(data: PositionData):
     """Save positions from the frontend Web Worker."""
     db = _sidecar()
     db.save_positions(data.positions, data.layout_hash, data.scope)
+    _invalidate_graph_cache()
     # Invalidate timeline cache since positions changed
     return {"data": {"saved": len(data.positions)}, "error": None}
 
 
 @router.post("/layout/recompute")
-async def recompute_layout():
+def recompute_layout():
     """Invalidate cached positions, forcing relayout on next load."""
     db = _sidecar()
     db.clear_positions()
     db.clear_timeline_cache()
+    _invalidate_graph_cache()
     return {"data": {"status": "cleared"}, "error": None}
 
 
@@ -188,8 +242,8 @@ class SimilarityRequest(BaseModel):
     entity_ids: list[str]
 
 
-@router.post("/embeddings/similarity")
-async def compute_similarity(req: SimilarityRequest):
+@router.post("/embeddings/similarity", response_class=ORJSONResponse)
+def compute_similarity(req: SimilarityRequest):
     """Compute pairwise cosine similarity matrix for entities."""
     reader = _kg()
     embeddings = reader.get_embeddings(req.entity_ids)
@@ -197,32 +251,39 @@ async def compute_similarity(req: SimilarityRequest):
     if len(embeddings) < 2:
         return {"data": {"matrix": {}, "ids": list(embeddings.keys())}, "error": None}
 
-    # Parse embedding blobs to numpy arrays
-    ids = list(embeddings.keys())
-    vectors = []
-    for eid in ids:
-        blob = embeddings[eid]
-        if len(blob) % 4 != 0:
-            continue  # skip malformed blobs
-        try:
-            vec = np.frombuffer(blob, dtype=np.float32)
-            vectors.append(vec)
-        except ValueError:
-            continue
-
-    mat = np.array(vectors)
-    # Normalize
-    norms = np.linalg.norm(mat, axis=1, keepdims=True)
-    norms[norms == 0] = 1.0
-    mat_norm = mat / norms
-    # Cosine similarity matrix
-    sim = (mat_norm @ mat_norm.T).tolist()
+    # Copy embedding blobs straight into one preallocated float32 matrix.
+    # The dimension is the most common blob length, so one stray blob can't
+    # decide which entities are kept; malformed blobs are skipped.
+    lengths = Counter(len(blob) for blob in embeddings.values() if len(blob) % 4 == 0)
+    row_bytes = lengths.most_common(1)[0][0] if lengths else 0
+    ids = [eid for eid, blob in embeddings.items() if len(blob) == row_bytes]
+    if len(ids) < 2:
+        return {"data": {"matrix": {}, "ids": ids}, "error": None}
+    buf = bytearray(len(ids) * row_bytes)
+    view = memoryview(buf)
+    for i, eid in enumerate(ids):
+        view[i * row_bytes : (i + 1) * row_bytes] = embeddings[eid]
+    mat = np.frombuffer(buf, dtype=np.float32).reshape(len(ids), row_bytes // 4)
+
+    # Cosine similarity matrix; squared norms in one einsum pass
+    sq_norms = np.einsum("ij,ij->i", mat, mat)
+    if simsimd is not None:
+        sim = 1.0 - np.asarray(simsimd.cdist(mat, mat, metric="cosine"))
+        # SimSIMD calls two zero vectors identical; score them 0 like the fallback
+        zero = sq_norms == 0
+        sim[zero, :] = 0.0
+        sim[:, zero] = 0.0
+    else:
+        # Scaled once after the matmul; zero vectors get similarity 0
+        with np.errstate(divide="ignore"):
+            inv = 1.0 / np.sqrt(sq_norms)
+        inv[~np.isfinite(inv)] = 0.0
+        sim = (mat @ mat.T) * np.outer(inv, inv)
 
     # Return as dict of dicts
-    matrix = {}
-    for i, id_a in enumerate(ids):
-        matrix[id_a] = {}
-        for j, id_b in enumerate(ids):
-            matrix[id_a][id_b] = round(sim[i][j], 4)
+    # Round in float64 so both paths emit the same shortest decimals (0.7071,
+    # not float32's 0.707099974...)
+    rounded = np.round(sim.astype(np.float64, copy=False), 4).tolist()
+    matrix = {id_a: dict(zip(ids, row)) for id_a, row in zip(ids, rounded)}
 
     return {"data": {"matrix": matrix, "ids": ids}, "error": None}
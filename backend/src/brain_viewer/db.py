@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 
 def _default_kg_path() -> Path:
     """Resolve the KG database path from environment or platform default."""
@@ -29,6 +33,107 @@ def _default_kg_path() -> Path:
     return Path.home() / ".llm_harness" / "knowledge.db"
 
 
+# Hot queries as (unscoped, scoped) pairs so each call reuses one of two
+# fixed statement texts from the connection's statement cache.
+_ENTITIES_SQL = (
+    (
+        "SELECT id, name, entity_type, date_added, date_modified, scope, metadata_json "
+        "FROM entities WHERE merged_into IS NULL"
+    ),
+    (
+        "SELECT id, name, entity_type, date_added, date_modified, scope, metadata_json "
+        "FROM entities WHERE merged_into IS NULL AND scope = ?"
+    ),
+)
+_OBSERVATIONS_SQL = (
+    (
+        "SELECT id, entity_id, text, severity, source_type, source_ref, "
+        "verification_status, date_added, tags_json, scope "
+        "FROM observations WHERE deprecated = 0"
+    ),
+    (
+        "SELECT id, entity_id, text, severity, source_type, source_ref, "
+        "verification_status, date_added, tags_json, scope "
+        "FROM observations WHERE deprecated = 0 AND scope = ?"
+    ),
+)
+_RELATIONS_SQL = (
+    (
+        "SELECT id, subject_id, predicate, object_id, source_type, source_ref, date_added, scope "
+        "FROM relations"
+    ),
+    (
+        "SELECT id, subject_id, predicate, object_id, source_type, source_ref, date_added, scope "
+        "FROM relations WHERE scope = ?"
+    ),
+)
+_COMMUNITIES_SQL = (
+    "SELECT id, level, member_entity_ids, summary, date_computed, scope FROM communities",
+    (
+        "SELECT id, level, member_entity_ids, summary, date_computed, scope FROM communities "
+        "WHERE scope = ?"
+    ),
+)
+_OBSERVATION_COUNTS_SQL = (
+    (
+        "SELECT entity_id, COUNT(*) as cnt FROM observations WHERE deprecated = 0 "
+        "GROUP BY entity_id"
+    ),
+    (
+        "SELECT entity_id, COUNT(*) as cnt FROM observations WHERE deprecated = 0 AND scope = ? "
+        "GROUP BY entity_id"
+    ),
+)
+
+# One indexable branch per endpoint column instead of an OR that the planner
+# may answer with a full scan; self-loops are only returned by the first branch.
+# (The KG is opened read-only, so this relies on the KG server's own indexes.)
+_ENTITY_RELATIONS_SQL = (
+    "SELECT id, subject_id, predicate, object_id, source_type, source_ref, date_added, scope "
+    "FROM relations WHERE subject_id = ? "
+    "UNION ALL "
+    "SELECT id, subject_id, predicate, object_id, source_type, source_ref, date_added, scope "
+    "FROM relations WHERE object_id = ? AND subject_id != ?"
+)
+
+# IDs are bound as one JSON array so every request reuses the same prepared
+# statement, rather than one "IN (?, ?, ...)" variant per list length that
+# would churn the connection's statement cache.
+_EMBEDDINGS_SQL = (
+    "SELECT id, embedding FROM entities "
+    "WHERE id IN (SELECT value FROM json_each(?)) AND embedding IS NOT NULL"
+)
+
+# New rows for the realtime poller in one statement. Each branch is tagged with
+# its index in _NEW_ROWS_TABLES and padded to a common width at the end.
+# Observation text is truncated to the 200 characters events carry.
+# Each branch is a rowid range seek on the table b-tree, so it already reads
+# only new rows; ordering by rowid alone lets SQLite merge the branches in
+# scan order without a temp sort, and rows are regrouped per table anyway.
+_NEW_ROWS_TABLES = (
+    ("entities", ("rowid", "id", "date_added", "scope", "name", "entity_type")),
+    ("observations", ("rowid", "id", "date_added", "scope", "entity_id", "text", "severity")),
+    ("relations", ("rowid", "id", "date_added", "scope", "subject_id", "predicate", "object_id")),
+)
+_NEW_ROWS_SQL = (
+    "SELECT 0, rowid, id, date_added, scope, name, entity_type, NULL "
+    "FROM entities WHERE rowid > ? "
+    "UNION ALL "
+    "SELECT 1, rowid, id, date_added, scope, entity_id, substr(text, 1, 200), severity "
+    "FROM observations WHERE rowid > ? "
+    "UNION ALL "
+    "SELECT 2, rowid, id, date_added, scope, subject_id, predicate, object_id "
+    "FROM relations WHERE rowid > ? "
+    "ORDER BY 2"
+)
+# Watermark snapshot in one statement; each MAX(rowid) is a single b-tree seek
+_MAX_ROWIDS_SQL = (
+    "SELECT (SELECT MAX(rowid) FROM entities), "
+    "(SELECT MAX(rowid) FROM observations), "
+    "(SELECT MAX(rowid) FROM relations)"
+)
+
+
 class KGReader:
     """Read-only connection to the KG SQLite database."""
 
@@ -41,84 +146,91 @@ class KGReader:
             uri=True,
             check_same_thread=False,
             timeout=5.0,
+            cached_statements=256,
         )
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode")  # just read, don't set
+        # Connection-local read tuning; none of these modify the KG file
+        self._conn.executescript(
+            "PRAGMA query_only=1; PRAGMA mmap_size=1073741824; PRAGMA cache_size=-131072; "
+            "PRAGMA temp_store=MEMORY;"
+        )
+        # Held for the duration of a snapshot() so threadpool handlers don't
+        # try to open a second transaction on the shared connection.
+        self._snapshot_lock = threading.RLock()
 
     def close(self):
         self._conn.close()
 
+    @contextmanager
+    def snapshot(self) -> Iterator[None]:
+        """Run several reads inside one read transaction.
+
+        Outside a transaction every query takes and releases its own read
+        lock and may see a different commit of the KG writer. Grouping the
+        reads acquires the lock once and gives them one consistent view.
+        """
+        with self._snapshot_lock:
+            if self._conn.in_transaction:  # nested snapshot on this thread
+                yield
+                return
+            self._conn.execute("BEGIN")
+            try:
+                yield
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _fetch_scoped(self, sql: tuple[str, str], scope: str | None) -> list[sqlite3.Row]:
+        """Run the unscoped or scoped variant of a precompiled query."""
+        if scope:
+            return self._conn.execute(sql[1], (scope,)).fetchall()
+        return self._conn.execute(sql[0]).fetchall()
+
     def get_data_version(self) -> int:
-        """Get SQLite data version for change detection."""
+        """Get SQLite data version for change detection.
+
+        PRAGMA data_version is an O(1) per-connection counter that moves
+        whenever another connection commits, so it serves as the KG's change
+        counter without needing triggers or tables in the read-only KG.
+        """
         row = self._conn.execute("PRAGMA data_version").fetchone()
         return row[0] if row else 0
 
     def get_entities(self, scope: str | None = None) -> list[dict[str, Any]]:
         """Fetch all non-merged entities."""
-        sql = """
-            SELECT id, name, entity_type, date_added, date_modified, scope,
-                   metadata_json
-            FROM entities
-            WHERE merged_into IS NULL
-        """
-        params: list[Any] = []
-        if scope:
-            sql += " AND scope = ?"
-            params.append(scope)
-        rows = self._conn.execute(sql, params).fetchall()
+        rows = self._fetch_scoped(_ENTITIES_SQL, scope)
         result = []
         for r in rows:
             d = dict(r)
-            d["metadata"] = json.loads(d.pop("metadata_json", "{}") or "{}")
+            raw = d.pop("metadata_json", None)
+            d["metadata"] = orjson.loads(raw) if raw else {}
             result.append(d)
         return result
 
     def get_observations(self, scope: str | None = None) -> list[dict[str, Any]]:
         """Fetch all non-deprecated observations."""
-        sql = """
-            SELECT id, entity_id, text, severity, source_type, source_ref,
-                   verification_status, date_added, tags_json, scope
-            FROM observations
-            WHERE deprecated = 0
-        """
-        params: list[Any] = []
-        if scope:
-            sql += " AND scope = ?"
-            params.append(scope)
-        rows = self._conn.execute(sql, params).fetchall()
+        rows = self._fetch_scoped(_OBSERVATIONS_SQL, scope)
         result = []
         for r in rows:
             d = dict(r)
-            d["tags"] = json.loads(d.pop("tags_json", "[]") or "[]")
+            raw = d.pop("tags_json", None)
+            d["tags"] = orjson.loads(raw) if raw else []
             result.append(d)
         return result
 
     def get_relations(self, scope: str | None = None) -> list[dict[str, Any]]:
         """Fetch all relations."""
-        sql = """
-            SELECT id, subject_id, predicate, object_id,
-                   source_type, source_ref, date_added, scope
-            FROM relations
-        """
-        params: list[Any] = []
-        if scope:
-            sql += " WHERE scope = ?"
-            params.append(scope)
-        rows = self._conn.execute(sql, params).fetchall()
+        rows = self._fetch_scoped(_RELATIONS_SQL, scope)
         return [dict(r) for r in rows]
 
     def get_communities(self, scope: str | None = None) -> list[dict[str, Any]]:
         """Fetch community data."""
-        sql = "SELECT id, level, member_entity_ids, summary, date_computed, scope FROM communities"
-        params: list[Any] = []
-        if scope:
-            sql += " WHERE scope = ?"
-            params.append(scope)
-        rows = self._conn.execute(sql, params).fetchall()
+        rows = self._fetch_scoped(_COMMUNITIES_SQL, scope)
         result = []
         for r in rows:
             d = dict(r)
-            d["member_entity_ids"] = json.loads(d["member_entity_ids"] or "[]")
+            raw = d["member_entity_ids"]
+            d["member_entity_ids"] = orjson.loads(raw) if raw else []
             result.append(d)
         return result
 
@@ -137,7 +249,8 @@ class KGReader:
         if not row:
             return None
         entity = dict(row)
-        entity["metadata"] = json.loads(entity.pop("metadata_json", "{}") or "{}")
+        raw = entity.pop("metadata_json", None)
+        entity["metadata"] = orjson.loads(raw) if raw else {}
 
         obs_rows = self._conn.execute(
             "SELECT id, text, severity, source_type, source_ref, verification_status, "
@@ -148,13 +261,13 @@ class KGReader:
         entity["observations"] = []
         for o in obs_rows:
             od = dict(o)
-            od["tags"] = json.loads(od.pop("tags_json", "[]") or "[]")
+            raw = od.pop("tags_json", None)
+            od["tags"] = orjson.loads(raw) if raw else []
             entity["observations"].append(od)
 
         rel_rows = self._conn.execute(
-            "SELECT id, subject_id, predicate, object_id, source_type, source_ref, date_added, scope "
-            "FROM relations WHERE subject_id = ? OR object_id = ?",
-            (entity_id, entity_id),
+            _ENTITY_RELATIONS_SQL,
+            (entity_id, entity_id, entity_id),
         ).fetchall()
         entity["relations"] = [dict(r) for r in rel_rows]
 
@@ -168,50 +281,32 @@ class KGReader:
 
     def get_observation_counts(self, scope: str | None = None) -> dict[str, int]:
         """Get observation count per entity (for node sizing)."""
-        sql = "SELECT entity_id, COUNT(*) as cnt FROM observations WHERE deprecated = 0"
-        params: list[Any] = []
-        if scope:
-            sql += " AND scope = ?"
-            params.append(scope)
-        sql += " GROUP BY entity_id"
-        rows = self._conn.execute(sql, params).fetchall()
+        rows = self._fetch_scoped(_OBSERVATION_COUNTS_SQL, scope)
         return {r["entity_id"]: r["cnt"] for r in rows}
 
     def get_embeddings(self, entity_ids: list[str]) -> dict[str, bytes]:
         """Get raw embedding blobs for given entity IDs."""
         if not entity_ids:
             return {}
-        placeholders = ",".join("?" * len(entity_ids))
-        rows = self._conn.execute(
-            f"SELECT id, embedding FROM entities WHERE id IN ({placeholders}) AND embedding IS NOT NULL",
-            entity_ids,
-        ).fetchall()
+        rows = self._conn.execute(_EMBEDDINGS_SQL, (orjson.dumps(entity_ids).decode(),)).fetchall()
         return {r["id"]: r["embedding"] for r in rows}
 
     def get_max_rowids(self) -> dict[str, int]:
         """Get current max rowid for each table (for polling watermark)."""
-        result = {}
-        for table in ("entities", "observations", "relations"):
-            row = self._conn.execute(f"SELECT MAX(rowid) as m FROM {table}").fetchone()
-            result[table] = row["m"] or 0 if row else 0
-        return result
+        row = self._conn.execute(_MAX_ROWIDS_SQL).fetchone()
+        return {table: row[i] or 0 for i, (table, _) in enumerate(_NEW_ROWS_TABLES)}
 
     def get_new_rows_since(self, watermarks: dict[str, int]) -> dict[str, list[dict[str, Any]]]:
         """Fetch rows added since the given rowid watermarks."""
-        result: dict[str, list[dict[str, Any]]] = {}
-
-        for table, cols in [
-            ("entities", "id, name, entity_type, date_added, scope"),
-            ("observations", "id, entity_id, text, severity, date_added, scope"),
-            ("relations", "id, subject_id, predicate, object_id, date_added, scope"),
-        ]:
-            wm = watermarks.get(table, 0)
-            rows = self._conn.execute(
-                f"SELECT rowid, {cols} FROM {table} WHERE rowid > ? ORDER BY rowid",
-                (wm,),
-            ).fetchall()
-            result[table] = [dict(r) for r in rows]
-
+        result: dict[str, list[dict[str, Any]]] = {table: [] for table, _ in _NEW_ROWS_TABLES}
+        cur = self._conn.cursor()
+        cur.row_factory = None  # plain tuples; keys come from _NEW_ROWS_TABLES
+        cur.execute(_NEW_ROWS_SQL, [watermarks.get(table, 0) for table, _ in _NEW_ROWS_TABLES])
+        # Per-tag (append, columns) pairs, bound once instead of per row
+        sinks = [(result[table].append, cols) for table, cols in _NEW_ROWS_TABLES]
+        for row in cur.fetchall():
+            append, cols = sinks[row[0]]
+            append(dict(zip(cols, row[1:])))
         return result
 
     def get_stats(self) -> dict[str, Any]:
@@ -9,27 +9,31 @@ from typing import Any
 LAYOUT_VERSION = "v3"
 
 
+def build_entity_community(communities: list[dict[str, Any]]) -> dict[str, str]:
+    """Map each member entity id to its community id (last community wins)."""
+    return {eid: comm["id"] for comm in communities for eid in comm.get("member_entity_ids", [])}
+
+
 def compute_structural_hash(
     entities: list[dict[str, Any]],
     relations: list[dict[str, Any]],
     communities: list[dict[str, Any]],
     observation_counts: dict[str, int],
+    entity_community: dict[str, str] | None = None,
 ) -> str:
     """Compute a deterministic SHA-256 hash of the graph structure.
 
     Inputs are sorted to ensure identical output for identical data regardless
     of query order. Includes observation counts so node size changes trigger
-    relayout.
+    relayout. Callers that already built the entity -> community map can
+    pass it as ``entity_community`` to skip rebuilding it here.
     """
-    # Build community membership map
-    entity_community: dict[str, str] = {}
-    for comm in communities:
-        for eid in comm.get("member_entity_ids", []):
-            entity_community[eid] = comm["id"]
+    if entity_community is None:
+        entity_community = build_entity_community(communities)
 
     # Entity tuples: (id, scope, community_id)
     entity_tuples = sorted(
-        (e["id"], e.get("scope", "global"), entity_community.get(e["id"], ""))
+        (e["id"], e.get("scope") or "global", entity_community.get(e["id"], ""))
         for e in entities
     )
 
@@ -42,12 +46,30 @@ def compute_structural_hash(
     # Observation counts: (entity_id, count)
     obs_tuples = sorted(observation_counts.items())
 
-    # Combine all into a single hashable string
-    parts = []
-    parts.append(f"layout_version:{LAYOUT_VERSION}")
-    parts.append("entities:" + "|".join(f"{a},{b},{c}" for a, b, c in entity_tuples))
-    parts.append("relations:" + "|".join(f"{a},{b},{c}" for a, b, c in relation_triples))
-    parts.append("obs_counts:" + "|".join(f"{a},{b}" for a, b in obs_tuples))
-
-    content = "\n".join(parts)
-    return hashlib.sha256(content.encode()).hexdigest()
+    # Stream fields straight into the hasher, separated by unit/record
+    # separators, instead of building one large intermediate string.
+    h = hashlib.sha256()
+    h.update(f"layout_version:{LAYOUT_VERSION}\n".encode())
+    h.update(b"entities:")
+    for a, b, c in entity_tuples:
+        h.update(a.encode())
+        h.update(b"\x1f")
+        h.update(b.encode())
+        h.update(b"\x1f")
+        h.update(c.encode())
+        h.update(b"\x1e")
+    h.update(b"\nrelations:")
+    for a, b, c in relation_triples:
+        h.update(a.encode())
+        h.update(b"\x1f")
+        h.update(b.encode())
+        h.update(b"\x1f")
+        h.update(c.encode())
+        h.update(b"\x1e")
+    h.update(b"\nobs_counts:")
+    for a, n in obs_tuples:
+        h.update(a.encode())
+        h.update(b"\x1f")
+        h.update(str(n).encode())
+        h.update(b"\x1e")
+    return h.hexdigest()
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from . import api, ws
 from .db import KGReader
@@ -57,7 +58,12 @@ async def lifespan(app: FastAPI):
     logger.info("Brain Viewer backend stopped")
 
 
-app = FastAPI(title="Brain Viewer", version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title="Brain Viewer",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
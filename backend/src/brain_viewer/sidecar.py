@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -41,6 +43,23 @@ CREATE TABLE IF NOT EXISTS schema_metadata (
 );
 """
 
+# WAL lets position saves / cache writes proceed without blocking readers;
+# NORMAL sync is durable enough for a rebuildable cache.
+_PRAGMA_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+"""
+
+# Timeline cache rows are zlib-compressed JSON bytes from schema_version 2 on;
+# version 1 rows hold plain JSON text and are treated as misses.
+_TIMELINE_CACHE_VERSION = 2
+# Level 1 already shrinks the repetitive event JSON several times over and
+# keeps compression off the request's critical path.
+_TIMELINE_CACHE_LEVEL = 1
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -54,6 +73,11 @@ class SidecarDB:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        # API handlers run in a threadpool and share this connection. Every
+        # statement runs under this lock, so one thread's commit can't land
+        # mid-transaction and readers never see a write half applied.
+        self._lock = threading.Lock()
+        self._conn.executescript(_PRAGMA_SQL)
         self._conn.executescript(_SCHEMA_SQL)
         # Ensure schema version
         existing = self._conn.execute(
@@ -72,18 +96,20 @@ class SidecarDB:
 
     def get_positions(self, scope: str = "global") -> dict[str, dict[str, float]]:
         """Get all persisted node positions for a given scope."""
-        rows = self._conn.execute(
-            "SELECT entity_id, x, y, z FROM node_positions WHERE scope = ?",
-            (scope,),
-        ).fetchall()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity_id, x, y, z FROM node_positions WHERE scope = ?",
+                (scope,),
+            ).fetchall()
         return {r["entity_id"]: {"x": r["x"], "y": r["y"], "z": r["z"]} for r in rows}
 
     def get_layout_hash(self, scope: str = "global") -> str | None:
         """Get the layout hash for a given scope."""
-        row = self._conn.execute(
-            "SELECT layout_hash FROM node_positions WHERE scope = ? LIMIT 1",
-            (scope,),
-        ).fetchone()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT layout_hash FROM node_positions WHERE scope = ? LIMIT 1",
+                (scope,),
+            ).fetchone()
         return row["layout_hash"] if row else None
 
     def save_positions(
@@ -91,59 +117,66 @@ class SidecarDB:
     ):
         """Save node positions (replace all for given scope)."""
         now = _now_iso()
-        self._conn.execute("DELETE FROM node_positions WHERE scope = ?", (scope,))
-        for entity_id, pos in positions.items():
-            self._conn.execute(
+        rows = [
+            (entity_id, pos["x"], pos["y"], pos["z"], scope, layout_hash, now, now)
+            for entity_id, pos in positions.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM node_positions WHERE scope = ?", (scope,))
+            self._conn.executemany(
                 "INSERT INTO node_positions (entity_id, x, y, z, scope, layout_hash, created_at, updated_at) "
                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (entity_id, pos["x"], pos["y"], pos["z"], scope, layout_hash, now, now),
+                rows,
             )
-        self._conn.commit()
 
     def clear_positions(self):
         """Clear all positions (forces relayout)."""
-        self._conn.execute("DELETE FROM node_positions")
-        self._conn.commit()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM node_positions")
 
     # ── Preferences ──
 
     def get_preference(self, key: str, default: str = "") -> str:
         """Get a user preference value."""
-        row = self._conn.execute(
-            "SELECT value FROM user_preferences WHERE key = ?", (key,)
-        ).fetchone()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM user_preferences WHERE key = ?", (key,)
+            ).fetchone()
         return row["value"] if row else default
 
     def set_preference(self, key: str, value: str):
         """Set a user preference value."""
         now = _now_iso()
-        self._conn.execute(
-            "INSERT OR REPLACE INTO user_preferences (key, value, updated_at) VALUES (?, ?, ?)",
-            (key, value, now),
-        )
-        self._conn.commit()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_preferences (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, value, now),
+            )
 
     # ── Timeline Cache ──
 
-    def get_timeline_cache(self, scope: str, params_hash: str) -> str | None:
-        """Get cached compressed timeline JSON."""
-        row = self._conn.execute(
-            "SELECT compressed_json FROM timeline_cache WHERE scope = ? AND params_hash = ?",
-            (scope, params_hash),
-        ).fetchone()
-        return row["compressed_json"] if row else None
-
-    def set_timeline_cache(self, scope: str, params_hash: str, data: str):
-        """Cache compressed timeline JSON."""
+    def get_timeline_cache(self, scope: str, params_hash: str) -> bytes | None:
+        """Get cached timeline JSON, decompressed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT compressed_json FROM timeline_cache "
+                "WHERE scope = ? AND params_hash = ? AND schema_version = ?",
+                (scope, params_hash, _TIMELINE_CACHE_VERSION),
+            ).fetchone()
+        return zlib.decompress(row["compressed_json"]) if row else None
+
+    def set_timeline_cache(self, scope: str, params_hash: str, data: bytes):
+        """Cache timeline JSON, stored as a zlib-compressed BLOB."""
         now = _now_iso()
-        self._conn.execute(
-            "INSERT OR REPLACE INTO timeline_cache (scope, params_hash, compressed_json, created_at, schema_version) "
-            "VALUES (?, ?, ?, ?, 1)",
-            (scope, params_hash, data, now),
-        )
-        self._conn.commit()
+        blob = zlib.compress(data, _TIMELINE_CACHE_LEVEL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO timeline_cache (scope, params_hash, compressed_json, created_at, schema_version) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (scope, params_hash, blob, now, _TIMELINE_CACHE_VERSION),
+            )
 
     def clear_timeline_cache(self):
         """Clear all timeline caches."""
-        self._conn.execute("DELETE FROM timeline_cache")
-        self._conn.commit()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM timeline_cache")
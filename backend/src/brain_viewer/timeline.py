@@ -3,74 +3,105 @@
 from __future__ import annotations
 
 import hashlib
-import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+import numpy as np
+import orjson
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_MISSING = int(np.iinfo(np.int64).min)
+# Layout of the naive ISO stamps that datetime64 and fromisoformat read
+# alike ("0" being any digit); a stamp is this cut at one of the lengths
+_NAIVE_ISO = b"0000-00-00T00:00:00.000000"
+_NAIVE_ISO_LENGTHS = [10, 13, 16, 19, 21, 22, 23, 24, 25, 26]
+_NAIVE_ISO_DIGITS = [i for i, c in enumerate(_NAIVE_ISO) if c == ord("0")]
+_NAIVE_ISO_MARKS = [4, 7, 13, 16, 19]
+_NAIVE_ISO_MARK_BYTES = np.frombuffer(b"--::.", dtype=np.uint8)
+
+try:
+    from numba import njit
+except ImportError:  # optional "jit" extra — NumPy path is used instead
+    njit = None
+
+
+@dataclass(slots=True)
+class TimelineEvent:
+    """A single replay event; serialized as-is by orjson (field order = JSON key order)."""
+
+    timestamp: str | None
+    event_type: str
+    entity_id: str | None
+    data: dict[str, Any]
+
 
 def build_event_stream(
     entities: list[dict[str, Any]],
     observations: list[dict[str, Any]],
     relations: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
+) -> list[TimelineEvent]:
     """Build a chronological event stream from KG tables.
 
     Events are sorted by (date_added ASC, table_priority ASC, id ASC)
     for deterministic ordering even when timestamps collide.
     """
-    events: list[dict[str, Any]] = []
+    events: list[TimelineEvent] = []
+    # Sort keys built alongside the events: (timestamp, table priority, id, index).
+    # The trailing index keeps the sort stable and maps keys back to events.
+    keys: list[tuple[str, int, str, int]] = []
 
     for e in entities:
-        events.append({
-            "timestamp": e["date_added"],
-            "event_type": "ENTITY_CREATED",
-            "entity_id": e["id"],
-            "priority": 0,
-            "data": {"name": e["name"], "entity_type": e["entity_type"], "scope": e.get("scope", "global")},
-        })
+        keys.append((e["date_added"] or "", 0, e["id"] or "", len(events)))
+        events.append(TimelineEvent(
+            e["date_added"],
+            "ENTITY_CREATED",
+            e["id"],
+            {"name": e["name"], "entity_type": e["entity_type"], "scope": e.get("scope", "global")},
+        ))
 
     for r in relations:
-        events.append({
-            "timestamp": r["date_added"],
-            "event_type": "RELATION_CREATED",
-            "entity_id": r["subject_id"],
-            "priority": 1,
-            "data": {
+        keys.append((r["date_added"] or "", 1, r["subject_id"] or "", len(events)))
+        events.append(TimelineEvent(
+            r["date_added"],
+            "RELATION_CREATED",
+            r["subject_id"],
+            {
                 "relation_id": r["id"],
                 "subject_id": r["subject_id"],
                 "predicate": r["predicate"],
                 "object_id": r["object_id"],
             },
-        })
+        ))
 
     for o in observations:
-        events.append({
-            "timestamp": o["date_added"],
-            "event_type": "OBSERVATION_ADDED",
-            "entity_id": o["entity_id"],
-            "priority": 2,
-            "data": {
+        keys.append((o["date_added"] or "", 2, o["entity_id"] or "", len(events)))
+        events.append(TimelineEvent(
+            o["date_added"],
+            "OBSERVATION_ADDED",
+            o["entity_id"],
+            {
                 "observation_id": o["id"],
                 "severity": o["severity"],
                 "text": o["text"][:200],  # truncate for payload size
                 "source_type": o["source_type"],
             },
-        })
+        ))
 
-    # Deterministic sort: timestamp, then table priority, then id
-    events.sort(key=lambda e: (e["timestamp"] or "", e["priority"], e.get("entity_id", "")))
-
-    # Remove the priority field from output
-    for e in events:
-        e.pop("priority", None)
+    # Deterministic sort: timestamp, then table priority, then id.
+    # Plain tuple comparison avoids a Python key function call per element.
+    keys.sort()
+    events = [events[k[3]] for k in keys]
 
     return events
 
 
 def compress_timeline(
-    events: list[dict[str, Any]],
+    events: list[TimelineEvent],
     gap_threshold_seconds: float = 60.0,
     compressed_pause_seconds: float = 0.5,
-) -> list[dict[str, Any]]:
+) -> list[TimelineEvent]:
     """Compress idle gaps in the event stream.
 
     Gaps longer than gap_threshold_seconds are collapsed to
@@ -80,42 +111,118 @@ def compress_timeline(
     if not events:
         return []
 
-    from datetime import datetime
-
-    def parse_ts(ts: str) -> datetime | None:
-        if not ts:
-            return None
-        try:
-            # Handle ISO format with or without timezone
-            ts = ts.replace("Z", "+00:00")
-            return datetime.fromisoformat(ts)
-        except (ValueError, TypeError):
-            return None
-
-    compressed: list[dict[str, Any]] = []
-    prev_time = None
-
-    for event in events:
-        curr_time = parse_ts(event["timestamp"])
-        if prev_time and curr_time:
-            gap = (curr_time - prev_time).total_seconds()
-            if gap > gap_threshold_seconds:
-                compressed.append({
-                    "timestamp": event["timestamp"],
-                    "event_type": "GAP_SKIPPED",
-                    "entity_id": None,
-                    "data": {
-                        "gap_seconds": gap,
-                        "display": _format_gap(gap),
-                    },
-                })
-        compressed.append(event)
-        if curr_time:
-            prev_time = curr_time
+    # Epoch microseconds per event (_MISSING where unparseable); gaps are
+    # measured between consecutive valid timestamps.
+    ts = _epoch_us_array([e.timestamp for e in events])
+    gap_idx, gap_lens = _find_gaps(ts, gap_threshold_seconds * 1e6)
+
+    compressed: list[TimelineEvent] = []
+    prev = 0
+    for i, gap_us in zip(gap_idx.tolist(), gap_lens.tolist()):
+        compressed.extend(events[prev:i])
+        gap = gap_us / 1e6
+        compressed.append(TimelineEvent(
+            events[i].timestamp,
+            "GAP_SKIPPED",
+            None,
+            {
+                "gap_seconds": gap,
+                "display": _format_gap(gap),
+            },
+        ))
+        prev = i
+    compressed.extend(events[prev:])
 
     return compressed
 
 
+def _find_gaps_numpy(ts: np.ndarray, threshold_us: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return (event index, gap length in µs) for every gap above threshold_us."""
+    valid = np.flatnonzero(ts != _MISSING)
+    deltas = np.diff(ts[valid])
+    hits = np.flatnonzero(deltas > threshold_us)
+    return valid[hits + 1], deltas[hits]
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _find_gaps(ts, threshold_us):
+        """Single-pass JIT equivalent of _find_gaps_numpy (no temporaries)."""
+        idx = np.empty(len(ts), np.int64)
+        gaps = np.empty(len(ts), np.int64)
+        n = 0
+        prev = _MISSING
+        for i in range(len(ts)):
+            t = ts[i]
+            if t == _MISSING:
+                continue
+            if prev != _MISSING and t - prev > threshold_us:
+                idx[n] = i
+                gaps[n] = t - prev
+                n += 1
+            prev = t
+        return idx[:n], gaps[:n]
+
+else:
+    _find_gaps = _find_gaps_numpy
+
+
+def _epoch_us_array(stamps: list[str | None]) -> np.ndarray:
+    """Parse ISO timestamps to an int64 array of epoch microseconds.
+
+    UTC ("Z" / "+00:00") and naive stamps are stripped to naive form and
+    parsed in one datetime64 conversion, which is far cheaper than building a
+    datetime per event. Stamps of any other shape go through _epoch_us, as
+    does the whole list if a date in it is out of range.
+    """
+    naive = [s.removesuffix("+00:00").removesuffix("Z") if s else "" for s in stamps]
+    try:
+        raw = np.array(naive, dtype="S")
+        if raw.itemsize < len(_NAIVE_ISO):
+            raw = raw.astype(f"S{len(_NAIVE_ISO)}")
+        # One NUL-padded row of bytes per stamp, so checking the layout is a
+        # few column comparisons instead of a Python loop. Anything else
+        # (offsets, partial dates, stray characters, which datetime64 may
+        # accept where fromisoformat doesn't) goes through _epoch_us.
+        chars = raw.view(np.uint8).reshape(len(raw), raw.itemsize)
+        head = chars[:, :len(_NAIVE_ISO)]
+        digits = head[:, _NAIVE_ISO_DIGITS]
+        marks = head[:, _NAIVE_ISO_MARKS]
+        lengths = np.count_nonzero(chars, axis=1)
+        # Past its length a row is NUL, so NUL passes any column and the
+        # length check decides where the stamp may end
+        plain = (
+            (((digits - ord("0")) <= 9) | (digits == 0)).all(axis=1)
+            & ((marks == _NAIVE_ISO_MARK_BYTES) | (marks == 0)).all(axis=1)
+            & np.isin(head[:, 10], list(b"T \0"))
+            & np.isin(lengths, _NAIVE_ISO_LENGTHS)
+            & ~(digits[:, :4] == ord("0")).all(axis=1)  # fromisoformat has no year 0
+        )
+        irregular = np.flatnonzero(~plain & (lengths > 0))
+        raw[irregular] = b""
+        # Empty strings become NaT, which converts to int64 min, i.e. _MISSING
+        us = raw.astype("datetime64[us]").astype(np.int64)
+    except ValueError:  # includes UnicodeEncodeError for non-ASCII stamps
+        return np.fromiter((_epoch_us(s) for s in stamps), dtype=np.int64, count=len(stamps))
+    for i in irregular:
+        us[i] = _epoch_us(stamps[i])
+    return us
+
+
+def _epoch_us(ts: str | None) -> int:
+    """Parse an ISO timestamp (with or without timezone) to epoch microseconds."""
+    if not ts:
+        return _MISSING
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return _MISSING
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_US
+
+
 def _format_gap(seconds: float) -> str:
     """Format a gap duration for display."""
     if seconds < 3600:
@@ -127,5 +234,8 @@ def _format_gap(seconds: float) -> str:
 
 def timeline_params_hash(scope: str | None, gap_threshold: float, compress: bool) -> str:
     """Compute a hash of timeline query parameters for caching."""
-    content = json.dumps({"scope": scope, "gap_threshold": gap_threshold, "compress": compress}, sort_keys=True)
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    content = orjson.dumps(
+        {"scope": scope, "gap_threshold": gap_threshold, "compress": compress},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(content).hexdigest()[:16]
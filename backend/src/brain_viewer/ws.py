@@ -1,15 +1,19 @@
-"""WebSocket realtime handler with SQLite polling."""
+"""WebSocket realtime handler with a shared change broadcaster."""
 
 from __future__ import annotations
 
 import asyncio
-import json
+import itertools
 import logging
+import sqlite3
 from typing import Any
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 
 from .db import KGReader
+from .timeline import TimelineEvent
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -17,120 +21,329 @@ logger = logging.getLogger(__name__)
 # Set during app startup
 kg: KGReader | None = None
 
-# Polling interval in seconds
-POLL_INTERVAL = 2.0
+# How often the broadcaster checks PRAGMA data_version (cheap, no table reads)
+CHANGE_CHECK_INTERVAL = 0.25
+# A heartbeat is sent after this long without changes
+HEARTBEAT_INTERVAL = 2.0
+# Pending messages per client before it is considered too slow and dropped
+CLIENT_QUEUE_SIZE = 256
+
+# Outgoing messages are coalesced into one frame, separated by ASCII RS
+BATCH_SEPARATOR = b"\x1e"
+MAX_BATCH = 128
+MAX_BATCH_DELAY = 0.02
+# Heartbeats carry no state, so one immutable frame is shared by all clients.
+# Run uvicorn with --ws-per-message-deflate false: compressing these tiny
+# frames costs more than it saves.
+_HEARTBEAT_FRAME = b'{"type":"heartbeat"}'
+
+# Broadcaster state: one queue of pre-encoded messages per client, the rowid
+# watermarks already broadcast, and a process-wide message sequence.
+# A None item tells a client its queue overflowed and it must reconnect.
+_subscribers: set[asyncio.Queue[bytes | None]] = set()
+_broadcaster: asyncio.Task | None = None
+_watermarks: dict[str, int] = {}
+_seq = itertools.count(1)
+
+
+def _build_events(new_rows: dict[str, list[dict[str, Any]]], watermarks: dict[str, int]) -> list[TimelineEvent]:
+    """Turn rows from get_new_rows_since into events, advancing watermarks in place.
+
+    Events use the slotted TimelineEvent, which orjson encodes directly.
+    Every row carries all of its table's columns, so fields are indexed
+    directly rather than looked up with defaults.
+    """
+    # Rows come back in rowid order per table, so the last row of each
+    # batch carries that table's new watermark.
+    entity_rows = new_rows.get("entities", [])
+    relation_rows = new_rows.get("relations", [])
+    observation_rows = new_rows.get("observations", [])
+
+    events: list[TimelineEvent] = [
+        TimelineEvent(
+            row["date_added"],
+            "ENTITY_CREATED",
+            row["id"],
+            {
+                "name": row["name"],
+                "entity_type": row["entity_type"],
+                "scope": row["scope"],
+            },
+        )
+        for row in entity_rows
+    ]
+    events.extend(
+        TimelineEvent(
+            row["date_added"],
+            "RELATION_CREATED",
+            row["subject_id"],
+            {
+                "relation_id": row["id"],
+                "subject_id": row["subject_id"],
+                "predicate": row["predicate"],
+                "object_id": row["object_id"],
+            },
+        )
+        for row in relation_rows
+    )
+    events.extend(
+        TimelineEvent(
+            row["date_added"],
+            "OBSERVATION_ADDED",
+            row["entity_id"],
+            {
+                "observation_id": row["id"],
+                "severity": row["severity"],
+                "text": row["text"],  # truncated in SQL
+            },
+        )
+        for row in observation_rows
+    )
+
+    if entity_rows:
+        watermarks["entities"] = entity_rows[-1]["rowid"]
+    if relation_rows:
+        watermarks["relations"] = relation_rows[-1]["rowid"]
+    if observation_rows:
+        watermarks["observations"] = observation_rows[-1]["rowid"]
+
+    return events
+
+
+def _parse_resume(raw: bytes | str) -> dict[str, int]:
+    """Extract rowid watermarks from the ?resume= JSON object, e.g. {"entities": 12, ...}.
+
+    Only known tables with non-negative numeric values are accepted; anything
+    else, including malformed JSON, resumes nothing. Clients only resume once
+    a hello or events message has told them the server's watermarks, so a
+    zero here means the table was empty then and everything in it is missed.
+    A fresh page gets its state from /graph and sends no resume at all.
+    """
+    try:
+        resume = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+    if not isinstance(resume, dict):
+        return {}
+    return {
+        key: int(val)
+        for key in ("entities", "observations", "relations")
+        if isinstance(val := resume.get(key), (int, float)) and val >= 0
+    }
+
+
+def _replay(client_wm: dict[str, int], bound: dict[str, int]) -> list[TimelineEvent]:
+    """Build events for rows a resuming client missed, up to the broadcaster's watermarks.
+
+    Tables the client sent no watermark for resume from the bound itself,
+    i.e. nothing is replayed for them.
+    """
+    replay_wm = {**bound, **client_wm}
+    new_rows = {
+        table: [r for r in rows if r["rowid"] <= bound.get(table, 0)]
+        for table, rows in kg.get_new_rows_since(replay_wm).items()
+    }
+    return _build_events(new_rows, replay_wm)
+
+
+def _publish(message: bytes) -> None:
+    """Queue a pre-encoded message for every client, dropping clients that lag."""
+    for queue in list(_subscribers):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            _subscribers.discard(queue)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+
+async def _broadcast_changes(last_version: int) -> None:
+    """Fetch new rows once per KG change and fan the encoded message out.
+
+    The KG is written by another process, so SQLite update hooks on this
+    read-only connection never fire; one cheap data_version probe and one
+    row fetch shared by all clients is the closest equivalent.
+    """
+    while _subscribers:
+        await asyncio.sleep(CHANGE_CHECK_INTERVAL)
+        if kg is None:
+            continue
+        try:
+            version = kg.get_data_version()
+            if version == last_version:
+                continue
+            last_version = version
+            events = _build_events(kg.get_new_rows_since(_watermarks), _watermarks)
+        except sqlite3.Error as e:
+            logger.error("Polling error: %s", e)
+            _publish(orjson.dumps({"type": "error", "seq": next(_seq), "error": str(e)}))
+            continue
+        except Exception:
+            # A bug here must not silently stop change delivery for every
+            # client; log it and retry on the next change.
+            logger.exception("Unexpected error in realtime broadcaster")
+            continue
+        if events:
+            _publish(orjson.dumps({
+                "type": "events",
+                "seq": next(_seq),
+                "events": events,
+                "watermarks": _watermarks,
+            }))
+
+
+def _subscribe(queue: asyncio.Queue[bytes | None]) -> None:
+    global _broadcaster
+    # A task cancelled by the last unsubscribe stays not-done until the loop
+    # delivers the cancellation, so count it as gone already.
+    if _broadcaster is None or _broadcaster.done() or _broadcaster.cancelling():
+        # Read the version before the watermarks: a commit landing between
+        # the two is then already covered by the watermarks and merely
+        # triggers one empty fetch, instead of being counted as seen while
+        # its rows sit above the watermarks.
+        version = kg.get_data_version()
+        _watermarks.clear()
+        _watermarks.update(kg.get_max_rowids())
+        _broadcaster = asyncio.create_task(_broadcast_changes(version))
+    _subscribers.add(queue)
+
+
+def _unsubscribe(queue: asyncio.Queue[bytes | None]) -> None:
+    _subscribers.discard(queue)
+    if not _subscribers and _broadcaster is not None:
+        _broadcaster.cancel()
+
+
+class _BatchSender:
+    """Buffers encoded messages and sends them as a single binary frame.
+
+    A frame is flushed once it holds MAX_BATCH messages or its oldest
+    message has waited MAX_BATCH_DELAY seconds.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self._websocket = websocket
+        self._buffer: list[bytes] = []
+        self._first_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._buffer)
+
+    def add(self, message: dict[str, Any]) -> None:
+        self.add_encoded(orjson.dumps(message))
+
+    def add_encoded(self, data: bytes) -> None:
+        if not self._buffer:
+            self._first_at = asyncio.get_running_loop().time()
+        self._buffer.append(data)
+
+    def time_left(self) -> float:
+        elapsed = asyncio.get_running_loop().time() - self._first_at
+        return max(0.0, MAX_BATCH_DELAY - elapsed)
+
+    def due(self) -> bool:
+        return len(self._buffer) >= MAX_BATCH or self.time_left() == 0.0
+
+    async def flush(self) -> None:
+        if self._buffer:
+            frame = BATCH_SEPARATOR.join(self._buffer)
+            self._buffer.clear()
+            await self._websocket.send_bytes(frame)
 
 
 @router.websocket("/ws/realtime")
 async def realtime_ws(websocket: WebSocket):
     """WebSocket endpoint for realtime KG change events.
 
-    Uses data_version + rowid watermarks for efficient change detection.
-    Client can send {"last_seen_rowids": {...}} on reconnect to resume.
+    Change detection and row fetching happen once in the shared broadcaster;
+    each connection only forwards the pre-encoded messages from its queue and
+    sends a heartbeat when nothing arrived for HEARTBEAT_INTERVAL seconds.
+    Client can connect with ?resume={"entities": N, ...} (URL-encoded rowid
+    watermarks) to resume; the rows it missed are replayed once at connect. Every connection then gets a
+    {"type": "hello", "watermarks": {...}} message with the server's current
+    watermarks, the resume point for its next reconnect.
+
+    Server messages arrive as binary frames holding one or more UTF-8 JSON
+    messages separated by ASCII RS (0x1e). Sequence numbers are increasing
+    per process, not per connection.
     """
     await websocket.accept()
 
     if kg is None:
-        await websocket.send_json({"error": "KG reader not initialized"})
+        await websocket.send_bytes(orjson.dumps({"error": "KG reader not initialized"}))
         await websocket.close()
         return
 
-    # Initialize watermarks
-    watermarks = kg.get_max_rowids()
-    last_data_version = kg.get_data_version()
-    seq = 0
+    # Resume state rides on the upgrade URL, so it is known without waiting
+    # for (and possibly missing) a first client message.
+    client_wm = _parse_resume(websocket.query_params.get("resume", ""))
+
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    sender = _BatchSender(websocket)
 
-    # Check if client sent resume data
+    # Everything up to the broadcaster's watermarks at subscribe time is
+    # replayed here, everything after it arrives through the queue, which
+    # buffers while the replay query runs off the event loop.
+    # The replay's seq is reserved before awaiting: broadcasts queued while
+    # the query runs get higher seqs, so the client doesn't drop them as
+    # out of order once they follow the replay.
+    _subscribe(queue)
+    bound = dict(_watermarks)
+    replay_seq = next(_seq)
     try:
-        initial = await asyncio.wait_for(websocket.receive_json(), timeout=0.5)
-        if isinstance(initial, dict) and "last_seen_rowids" in initial:
-            client_wm = initial["last_seen_rowids"]
-            if isinstance(client_wm, dict):
-                # Merge onto defaults — only accept known keys with numeric values
-                for key in ("entities", "observations", "relations"):
-                    val = client_wm.get(key)
-                    if isinstance(val, (int, float)) and val >= 0:
-                        watermarks[key] = int(val)
-    except WebSocketDisconnect:
-        return
-    except (asyncio.TimeoutError, json.JSONDecodeError, Exception):
-        pass
+        if client_wm:
+            events = await run_in_threadpool(_replay, client_wm, bound)
+            if events:
+                sender.add({
+                    "type": "events",
+                    "seq": replay_seq,
+                    "events": events,
+                    "watermarks": bound,
+                })
+        # Tell the client where it now stands, so it can resume after a
+        # reconnect even if no change is broadcast in the meantime
+        sender.add({"type": "hello", "watermarks": bound})
+    except sqlite3.Error as e:
+        logger.error("Replay error: %s", e)
+        sender.add({"type": "error", "seq": replay_seq, "error": str(e)})
 
     try:
         while True:
-            await asyncio.sleep(POLL_INTERVAL)
-
+            timeout = sender.time_left() if sender.pending else HEARTBEAT_INTERVAL
             try:
-                # Quick check: did anything change?
-                current_version = kg.get_data_version()
-                if current_version == last_data_version:
-                    # Send heartbeat
-                    seq += 1
-                    await websocket.send_json({"type": "heartbeat", "seq": seq})
-                    continue
-
-                last_data_version = current_version
-
-                # Something changed — fetch new rows
-                new_rows = kg.get_new_rows_since(watermarks)
-
-                events: list[dict[str, Any]] = []
-
-                for row in new_rows.get("entities", []):
-                    events.append({
-                        "event_type": "ENTITY_CREATED",
-                        "timestamp": row["date_added"],
-                        "entity_id": row["id"],
-                        "data": {
-                            "name": row["name"],
-                            "entity_type": row["entity_type"],
-                            "scope": row.get("scope", "global"),
-                        },
-                    })
-                    watermarks["entities"] = max(watermarks["entities"], row["rowid"])
-
-                for row in new_rows.get("relations", []):
-                    events.append({
-                        "event_type": "RELATION_CREATED",
-                        "timestamp": row["date_added"],
-                        "entity_id": row["subject_id"],
-                        "data": {
-                            "relation_id": row["id"],
-                            "subject_id": row["subject_id"],
-                            "predicate": row["predicate"],
-                            "object_id": row["object_id"],
-                        },
-                    })
-                    watermarks["relations"] = max(watermarks["relations"], row["rowid"])
-
-                for row in new_rows.get("observations", []):
-                    events.append({
-                        "event_type": "OBSERVATION_ADDED",
-                        "timestamp": row["date_added"],
-                        "entity_id": row["entity_id"],
-                        "data": {
-                            "observation_id": row["id"],
-                            "severity": row["severity"],
-                            "text": row.get("text", "")[:200],
-                        },
-                    })
-                    watermarks["observations"] = max(watermarks["observations"], row["rowid"])
-
-                if events:
-                    seq += 1
-                    await websocket.send_json({
-                        "type": "events",
-                        "seq": seq,
-                        "events": events,
-                        "watermarks": watermarks,
-                    })
-
-            except Exception as e:
-                logger.error("Polling error: %s", e)
-                seq += 1
-                await websocket.send_json({"type": "error", "seq": seq, "error": str(e)})
+                message = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if sender.pending:
+                    await sender.flush()
+                else:
+                    await websocket.send_bytes(_HEARTBEAT_FRAME)
+                continue
+
+            if message is None:
+                logger.warning("WebSocket client too slow, dropping connection")
+                await sender.flush()
+                await websocket.close(code=1013)
+                return
+            sender.add_encoded(message)
+            # Drain whatever else is already queued into the same frame
+            while not queue.empty() and len(sender) < MAX_BATCH:
+                message = queue.get_nowait()
+                if message is None:
+                    queue.put_nowait(None)
+                    break
+                sender.add_encoded(message)
+
+            if sender.due():
+                await sender.flush()
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     except Exception as e:
         logger.error("WebSocket error: %s", e)
+    finally:
+        _unsubscribe(queue)
@@ -109,7 +109,7 @@ function CameraController({
   // Explicit DOM target for TrackballControls — same element R3F uses
   const controlsDomElement = (events.connected ?? gl.domElement) as HTMLElement;
 
-  // Expose goHome on the window for the Home button
+  // Expose goHome (Home button) and zoom (screenshot scripts) on the window
   useEffect(() => {
     (window as any).__brainViewerGoHome = () => {
       if (homeView.current && controlsRef.current) {
@@ -121,7 +121,21 @@ function CameraController({
         saveCameraState(h);
       }
     };
-    return () => { delete (window as any).__brainViewerGoHome; };
+    // Dolly toward the orbit target by `factor` in one step (used by scripts/capture.py)
+    (window as any).__brainViewerZoom = (factor: number) => {
+      const controls = controlsRef.current;
+      if (!controls || !(factor > 0)) return;
+      const offset = camera.position.clone().sub(controls.target);
+      offset.setLength(
+        THREE.MathUtils.clamp(offset.length() / factor, controls.minDistance, controls.maxDistance)
+      );
+      camera.position.copy(controls.target).add(offset);
+      controls.update();
+    };
+    return () => {
+      delete (window as any).__brainViewerGoHome;
+      delete (window as any).__brainViewerZoom;
+    };
   }, [camera]);
 
   // WASD+QE key tracking + speed controls (R/F)
@@ -474,6 +488,50 @@ function SceneReadySignal() {
   return null;
 }
 
+// Consecutive frames without camera motion before the scene counts as idle
+const IDLE_FRAMES = 5;
+const IDLE_POSITION_EPSILON_SQ = 1e-6;
+const IDLE_ANGLE_EPSILON = 1e-6;
+
+/**
+ * Exposes window.__brainViewerFrameIdle: true once the scene is ready and the
+ * camera has been still for IDLE_FRAMES frames. Screenshot scripts wait on it
+ * instead of sleeping a fixed time. Damped controls decay asymptotically, so
+ * "still" means below a small tolerance rather than bit-identical.
+ */
+function FrameIdleSignal() {
+  const { camera } = useThree();
+  const sceneReady = useGraphStore((s) => s.sceneReady);
+  const themeConfig = useResolvedTheme();
+  const lastPosition = useRef(new THREE.Vector3());
+  const lastQuaternion = useRef(new THREE.Quaternion());
+  const stillFrames = useRef(0);
+
+  // A theme switch re-renders every material; count still frames from scratch
+  useEffect(() => {
+    stillFrames.current = 0;
+    (window as any).__brainViewerFrameIdle = false;
+  }, [sceneReady, themeConfig]);
+
+  useEffect(() => () => { delete (window as any).__brainViewerFrameIdle; }, []);
+
+  useFrame(() => {
+    const still =
+      lastPosition.current.distanceToSquared(camera.position) < IDLE_POSITION_EPSILON_SQ &&
+      lastQuaternion.current.angleTo(camera.quaternion) < IDLE_ANGLE_EPSILON;
+    if (still) {
+      stillFrames.current += 1;
+    } else {
+      lastPosition.current.copy(camera.position);
+      lastQuaternion.current.copy(camera.quaternion);
+      stillFrames.current = 0;
+    }
+    (window as any).__brainViewerFrameIdle = sceneReady && stillFrames.current >= IDLE_FRAMES;
+  });
+
+  return null;
+}
+
 function SceneContent() {
   const themeConfig = useResolvedTheme();
   const reducedMotion = useGraphStore((s) => s.reducedMotion);
@@ -513,6 +571,7 @@ function SceneContent() {
       <CameraController controlsEnabled={!nodePointerActive} controlsRefExternal={controlsRef} />
       <FlyToController controlsRef={controlsRef} />
       <SceneReadySignal />
+      <FrameIdleSignal />
 
       {bloom.enabled && !reducedMotion && (
         <EffectComposer>
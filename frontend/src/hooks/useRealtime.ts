@@ -12,7 +12,14 @@ interface LastSeenRowids {
   observations: number;
 }
 
-/** Backend sends {type: "events", seq, events: [...], watermarks: {...}} or {type: "heartbeat", seq} */
+/** Messages arrive batched in binary frames, separated by ASCII RS (0x1e). */
+const MESSAGE_SEPARATOR = "\x1e";
+const frameDecoder = new TextDecoder();
+
+/**
+ * Backend sends {type: "hello", watermarks: {...}} on connect, then
+ * {type: "events", seq, events: [...], watermarks: {...}} or {type: "heartbeat"}
+ */
 interface WsEventsMessage {
   type: "events";
   seq: number;
@@ -139,6 +146,9 @@ export function useRealtime(enabled: boolean): { connected: boolean; lastHeartbe
     relations: 0,
     observations: 0,
   });
+  // Set once the backend has reported its watermarks; until then this page's
+  // state comes only from /graph and there is nothing to resume.
+  const hasWatermarksRef = useRef(false);
   const lastSeenSeqRef = useRef(0);
   const seenObservationIdsRef = useRef(new Set<string>());
 
@@ -160,6 +170,7 @@ export function useRealtime(enabled: boolean): { connected: boolean; lastHeartbe
     closedRef.current = false;
 
     const updateWatermarks = (watermarks: Partial<Record<RowidKey, number>>) => {
+      hasWatermarksRef.current = true;
       for (const [key, value] of Object.entries(watermarks)) {
         if (!isRowidKey(key)) continue;
         const numeric = asNumber(value);
@@ -238,23 +249,25 @@ export function useRealtime(enabled: boolean): { connected: boolean; lastHeartbe
     const connect = () => {
       if (closedRef.current) return;
 
-      const ws = new WebSocket(WS_URL);
+      // Resume state goes in the URL so the server has it at the handshake
+      const url = hasWatermarksRef.current
+        ? `${WS_URL}?resume=${encodeURIComponent(JSON.stringify(lastSeenRowidsRef.current))}`
+        : WS_URL;
+      const ws = new WebSocket(url);
+      ws.binaryType = "arraybuffer";
       wsRef.current = ws;
 
       ws.onopen = () => {
         setConnected(true);
         reconnectAttemptRef.current = 0;
-        ws.send(
-          JSON.stringify({
-            last_seen_rowids: lastSeenRowidsRef.current,
-          })
-        );
+        // Sequence numbers restart with the backend process; watermarks carry resume state
+        lastSeenSeqRef.current = 0;
       };
 
-      ws.onmessage = (msgEvent: MessageEvent<string>) => {
+      const handleMessage = (raw: string) => {
         let parsed: unknown;
         try {
-          parsed = JSON.parse(msgEvent.data);
+          parsed = JSON.parse(raw);
         } catch {
           return;
         }
@@ -269,6 +282,12 @@ export function useRealtime(enabled: boolean): { connected: boolean; lastHeartbe
           return;
         }
 
+        if (type === "hello") {
+          const watermarks = asRecord(message.watermarks);
+          if (watermarks) updateWatermarks(watermarks as Partial<Record<RowidKey, number>>);
+          return;
+        }
+
         if (type === "events") {
           const eventsMsg = message as unknown as WsEventsMessage;
           // Skip duplicate/out-of-order messages
@@ -285,6 +304,13 @@ export function useRealtime(enabled: boolean): { connected: boolean; lastHeartbe
         }
       };
 
+      ws.onmessage = (msgEvent: MessageEvent<ArrayBuffer | string>) => {
+        const frame = typeof msgEvent.data === "string" ? msgEvent.data : frameDecoder.decode(msgEvent.data);
+        for (const raw of frame.split(MESSAGE_SEPARATOR)) {
+          if (raw) handleMessage(raw);
+        }
+      };
+
       ws.onerror = () => {
         ws.close();
       };
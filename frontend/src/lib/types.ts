@@ -89,9 +89,12 @@ export type RealtimeMessage =
       events: RealtimeEvent[];
       watermarks: Partial<Record<"entities" | "relations" | "observations", number>>;
     }
+  | {
+      type: "hello";
+      watermarks: Partial<Record<"entities" | "relations" | "observations", number>>;
+    }
   | {
       type: "heartbeat";
-      seq: number;
     }
   | {
       type: "error";
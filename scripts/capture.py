@@ -0,0 +1,141 @@
+"""Capture overview and zoomed screenshots for any set of themes.
+
+One browser and page are reused for every theme, so the graph is loaded and
+laid out once per run instead of once per script.
+
+    python scripts/capture.py                                  # all themes, overview only
+    python scripts/capture.py --zoom 8                         # + one zoomed shot per theme
+    python scripts/capture.py --themes neural --zoom 8 4 --console
+"""
+import argparse
+from pathlib import Path
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright
+
+URL = "http://localhost:5174"
+OUT = Path(__file__).resolve().parent.parent / "screenshots"
+THEMES = ("clean", "neural", "organic")
+
+# True once the graph has loaded and the layout overlay is gone
+GRAPH_READY_JS = """() => {
+    const el = document.getElementById('root');
+    if (!el) return false;
+    const text = el.innerText || '';
+    if (text.includes('Computing layout')) return false;
+    if (text.includes('Loading graph')) return false;
+    // Make sure entities are loaded (status bar shows count)
+    return text.includes('entities');
+}"""
+
+# Set by the app once the scene is ready and the camera has stopped moving
+FRAME_IDLE_JS = "() => window.__brainViewerFrameIdle === true"
+# Resolves after two animation frames, so the render loop has seen any change
+NEXT_FRAMES_JS = "() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))"
+
+WEBGL_INFO_JS = """() => {
+    const canvas = document.querySelector('canvas');
+    if (!canvas) return 'No canvas found';
+    const gl = canvas.getContext('webgl2') || canvas.getContext('webgl');
+    if (!gl) return 'No WebGL context';
+    return {
+        error: gl.getError(),
+        renderer: gl.getParameter(gl.RENDERER),
+        vendor: gl.getParameter(gl.VENDOR),
+        version: gl.getParameter(gl.VERSION),
+        glslVersion: gl.getParameter(gl.SHADING_LANGUAGE_VERSION),
+    };
+}"""
+
+
+def wait_for_idle(page, timeout):
+    """Block until the scene reports itself idle after the last interaction.
+
+    Falls back to a short fixed pause if the flag never turns true, e.g. when
+    the frontend build predates it.
+    """
+    page.evaluate(NEXT_FRAMES_JS)
+    try:
+        page.wait_for_function(FRAME_IDLE_JS, timeout=timeout)
+    except PlaywrightTimeoutError:
+        page.wait_for_timeout(200)
+
+
+def wait_for_graph(page, timeout=300000):
+    """Block until the graph is rendered and settled."""
+    print("Waiting for graph to render...")
+    page.wait_for_function(GRAPH_READY_JS, timeout=timeout)
+    wait_for_idle(page, 9000)
+
+
+def select_theme(page, theme):
+    page.evaluate(
+        "(name) => document.querySelectorAll('button').forEach(b => { if (b.textContent === name) b.click() })",
+        theme.capitalize(),
+    )
+    wait_for_idle(page, 6000)
+
+
+def go_home(page):
+    page.evaluate("if (window.__brainViewerGoHome) window.__brainViewerGoHome()")
+    wait_for_idle(page, 2400)
+
+
+def zoom_in(page, factor):
+    """Move the camera `factor` times closer to the orbit target in one step."""
+    page.evaluate("(f) => window.__brainViewerZoom && window.__brainViewerZoom(f)", factor)
+    wait_for_idle(page, 3000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--themes", nargs="+", choices=THEMES, default=list(THEMES))
+    parser.add_argument(
+        "--zoom", nargs="*", type=float, default=[],
+        help="zoom factor per zoomed shot; each value zooms further from the previous shot",
+    )
+    parser.add_argument("--out", type=Path, default=OUT)
+    parser.add_argument("--console", action="store_true", help="print WebGL info and console warnings/errors")
+    args = parser.parse_args()
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=False, args=["--disable-gpu-sandbox"])
+        page = browser.new_page(viewport={"width": 1400, "height": 900})
+
+        console_msgs = []
+        page.on("console", lambda msg: console_msgs.append(f"[{msg.type}] {msg.text}"))
+        page.on("pageerror", lambda err: console_msgs.append(f"[PAGE_ERROR] {err}"))
+
+        page.goto(args.url)
+        wait_for_graph(page)
+
+        if args.console:
+            print(f"WebGL info: {page.evaluate(WEBGL_INFO_JS)}")
+
+        for theme in args.themes:
+            go_home(page)
+            select_theme(page, theme)
+            page.screenshot(path=str(args.out / f"{theme}-theme.png"))
+            print(f"Captured {theme} overview")
+
+            for i, factor in enumerate(args.zoom):
+                zoom_in(page, factor)
+                suffix = "zoomed" if i == 0 else f"zoomed-{i + 1}"
+                page.screenshot(path=str(args.out / f"{theme}-{suffix}.png"))
+                print(f"Captured {theme} {suffix}")
+
+        if args.console:
+            print("\nConsole messages:")
+            for msg in console_msgs:
+                lowered = msg.lower()
+                if any(key in lowered for key in ("error", "warn", "webgl", "shader")):
+                    print(f"  {msg}")
+
+        browser.close()
+        print("Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Check browser console for WebGL/shader errors."""
+from capture import URL, WEBGL_INFO_JS, wait_for_graph
 from playwright.sync_api import sync_playwright
 
-URL = "http://localhost:5174"
 
 def main():
     with sync_playwright() as p:
@@ -15,36 +15,10 @@ def main():
 
         page.goto(URL)
 
-        # Wait for graph to render
-        print("Waiting for graph to render...")
-        page.wait_for_function(
-            """() => {
-                const el = document.getElementById('root');
-                if (!el) return false;
-                const text = el.innerText || '';
-                if (text.includes('Computing layout')) return false;
-                if (text.includes('Loading graph')) return false;
-                return text.includes('entities');
-            }""",
-            timeout=60000,
-        )
-        page.wait_for_timeout(3000)
+        wait_for_graph(page, timeout=60000)
 
         # Also check for WebGL errors via JS
-        webgl_info = page.evaluate("""() => {
-            const canvas = document.querySelector('canvas');
-            if (!canvas) return 'No canvas found';
-            const gl = canvas.getContext('webgl2') || canvas.getContext('webgl');
-            if (!gl) return 'No WebGL context';
-            const err = gl.getError();
-            return {
-                renderer: gl.getParameter(gl.RENDERER),
-                version: gl.getParameter(gl.VERSION),
-                glslVersion: gl.getParameter(gl.SHADING_LANGUAGE_VERSION),
-                error: err,
-                errorName: err === 0 ? 'NO_ERROR' : `GL_ERROR_${err}`,
-            };
-        }""")
+        webgl_info = page.evaluate(WEBGL_INFO_JS)
 
         # Check shader compilation by examining Three.js internal state
         shader_check = page.evaluate("""() => {
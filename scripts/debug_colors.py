@@ -1,7 +1,7 @@
 """Debug: check nodeColor attribute values in the InstancedMesh."""
+from capture import URL, wait_for_graph
 from playwright.sync_api import sync_playwright
 
-URL = "http://localhost:5174"
 
 def main():
     with sync_playwright() as p:
@@ -9,19 +9,7 @@ def main():
         page = browser.new_page(viewport={"width": 1400, "height": 900})
         page.goto(URL)
 
-        print("Waiting for graph to render...")
-        page.wait_for_function(
-            """() => {
-                const el = document.getElementById('root');
-                if (!el) return false;
-                const text = el.innerText || '';
-                if (text.includes('Computing layout')) return false;
-                if (text.includes('Loading graph')) return false;
-                return text.includes('entities');
-            }""",
-            timeout=60000,
-        )
-        page.wait_for_timeout(3000)
+        wait_for_graph(page, timeout=60000)
 
         # Check the nodeColor attribute on the InstancedMesh geometry
         result = page.evaluate("""() => {
@@ -149,7 +149,8 @@ kill_port(5174)
 
 # --- Start backend (hidden, no console window) ---
 backend = subprocess.Popen(
-    [VENV_PYTHON, "-m", "uvicorn", "brain_viewer.main:app", "--port", "8000"],
+    [VENV_PYTHON, "-m", "uvicorn", "brain_viewer.main:app", "--port", "8000",
+     "--ws-per-message-deflate", "false"],
     cwd=os.path.join(PROJECT_DIR, "backend", "src"),
     creationflags=NO_WINDOW,
 )